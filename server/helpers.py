@@ -1,8 +1,9 @@
 import random
+from typing import Any, List
 
-def reshuffle_cards(draw_pile, discard_pile):
+def reshuffle_cards(draw_pile: List[Any], discard_pile: List[Any]) -> None:
     """Shuffle discard pile into the draw pile."""
-    draw_pile.extend(discard_pile)
-    discard_pile.clear()
+    if discard_pile:
+        draw_pile.extend(discard_pile)
+        discard_pile.clear()
     random.shuffle(draw_pile)
-
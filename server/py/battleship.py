@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, FrozenSet, Iterable, Tuple
+import functools
 import random
 import string
 from enum import Enum
@@ -41,6 +42,10 @@ class PlayerState(BaseModel):
 
 
 
+def has_placed_all_ships(player: PlayerState) -> bool:
+    return len(player.ships) >= 5 and all(ship.location is not None for ship in player.ships)
+
+
 class GamePhase(str, Enum):
     SETUP = 'setup'
     RUNNING = 'running'
@@ -54,23 +59,20 @@ class BattleshipGameState(BaseModel):
     players: List[PlayerState] = [PlayerState(name='Player1'), PlayerState(name='Player2')]
 
     def all_ships_located(self) -> bool:
-        for ship in self.players[self.idx_player_active].ships:
-            if ship.location is None:
-                return False
-        return True
+        return all(ship.location is not None for ship in self.players[self.idx_player_active].ships)
 
     def get_player_ships(self, active_player: bool) -> List[Ship]:
         if active_player:
             idx_player = self.idx_player_active
         else:
-            idx_player = (self.idx_player_active + 1) % 2
+            idx_player = self.idx_player_active ^ 1
         return self.players[idx_player].ships
 
     def get_player_shots(self, active_player: bool) -> List[str]:
         if active_player:
             idx_player = self.idx_player_active
         else:
-            idx_player = (self.idx_player_active + 1) % 2
+            idx_player = self.idx_player_active ^ 1
         return self.players[idx_player].shots
 
     def check_if_finished(self) -> bool:
@@ -78,16 +80,17 @@ class BattleshipGameState(BaseModel):
         if not self.all_ships_located():
             return False
         shots = set(self.players[self.idx_player_active].shots)
-        for ship in self.players[(self.idx_player_active + 1) % 2].ships:
-            if ship.location is not None:
-                if len(set(ship.location).difference(shots)) > 0:
-                    return False
+        for ship in self.players[self.idx_player_active ^ 1].ships:
+            if ship.location is not None and not shots.issuperset(ship.location):
+                return False
         return True
 
     def apply_action(self, action: BattleshipAction) -> None:
+        me = self.players[self.idx_player_active]
+        opp = self.players[self.idx_player_active ^ 1]
         if action.action_type == 'set_ship':
             existing_ship = False
-            for ship in self.get_player_ships(active_player=True):
+            for ship in me.ships:
                 if ship.name == action.ship_name:
                     ship.location = action.location.copy()
                     existing_ship = True
@@ -97,112 +100,141 @@ class BattleshipGameState(BaseModel):
                     name=action.ship_name if action.ship_name is not None else 'ship',
                     length=len(action.location),
                     location=action.location)
-                self.get_player_ships(active_player=True).append(new_ship)
+                me.ships.append(new_ship)
             # test if both player have set all ship locations -> phase = running
-            all_ships_located = True
-            for player in self.players:
-                for ship in player.ships:
-                    all_ships_located = all_ships_located and ship.location is not None
-                if len(player.ships) < 5:
-                    all_ships_located = False
-            if all_ships_located:
+            # (only the active player's ships changed, so check them first)
+            if has_placed_all_ships(me) and has_placed_all_ships(opp):
                 self.phase = GamePhase.RUNNING
         else:
-            self.players[self.idx_player_active].shots.extend(action.location)
-            opponent_ship_locations = [
-                loc for ship in self.get_player_ships(False) if ship.location is not None for loc in ship.location]
-            if action.location[0] in opponent_ship_locations:
-                self.players[self.idx_player_active].successful_shots.extend(action.location)
+            me.shots.extend(action.location)
+            opponent_ship_locations = frozenset().union(*(ship.location for ship in opp.ships if ship.location))
+            hits = opponent_ship_locations.intersection(action.location)
+            if hits:
+                me.successful_shots.extend(loc for loc in action.location if loc in hits)
         if self.check_if_finished():
             self.phase = GamePhase.FINISHED
             self.winner = self.idx_player_active
         else:
-            self.idx_player_active = (self.idx_player_active + 1) % 2
+            self.idx_player_active ^= 1
 
     def get_masked_state(self, idx_player: int) -> "BattleshipGameState":
-        other_player = (idx_player + 1) % 2
-        masked_state = BattleshipGameState()
-        masked_state.idx_player_active = self.idx_player_active
-        masked_state.winner = self.winner
-        masked_state.phase = self.phase
-        masked_state.players[idx_player] = self.players[idx_player]
-        masked_state.players[other_player].shots = self.players[other_player].shots
-        masked_state.players[other_player].successful_shots = self.players[other_player].successful_shots
+        other_player = idx_player ^ 1
+        other = self.players[other_player]
 
         # show ships that were sunk
-        masked_state.players[other_player].ships = []
-        for ship in self.players[other_player].ships:
+        sunk_ships = []
+        successful_shots = set(self.players[idx_player].successful_shots)
+        for ship in other.ships:
             if ship.location is not None:
-                cnt = 0
-                for shot in self.players[idx_player].successful_shots:
-                    if shot in ship.location:
-                        cnt += 1
-                if cnt == len(ship.location):
-                    masked_state.players[other_player].ships.append(ship)
+                if len(successful_shots.intersection(ship.location)) == len(ship.location):
+                    sunk_ships.append(ship)
 
-        return masked_state
+        players = [self.players[idx_player]] * 2
+        players[other_player] = PlayerState(
+            name=other.name, ships=sunk_ships, shots=other.shots, successful_shots=other.successful_shots)
+        return BattleshipGameState(
+            idx_player_active=self.idx_player_active, phase=self.phase, winner=self.winner, players=players)
 
 
-def get_possible_locations(ship_length: int, board_size: int) -> List[List[str]]:
+_X_COORDS_10: Tuple[str, ...] = tuple(string.ascii_uppercase[:10])
+_Y_COORDS_10: Tuple[str, ...] = tuple(str(y) for y in range(1, 11))
+
+
+def get_coord_names(board_size: int) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    if board_size == 10:
+        return _X_COORDS_10, _Y_COORDS_10
+    return tuple(string.ascii_uppercase[:board_size]), tuple(str(y) for y in range(1, board_size + 1))
+
+
+@functools.lru_cache(maxsize=None)
+def get_possible_locations(ship_length: int, board_size: int) -> Tuple[Tuple[str, ...], ...]:
     if ship_length < 1:
         raise ValueError('Ship length has to be positive')
     if ship_length > board_size:
         raise ValueError(f"Ship of length {ship_length} is too large for board size {board_size}")
-    x_names = list(string.ascii_uppercase)[:board_size]
-    y_names = [str(y) for y in range(1, board_size + 1)]
-    options = []
+    x_names, y_names = get_coord_names(board_size)
+    # cell names by column (same x) and by row (same y), so every location is a slice
+    columns = [tuple(x_name + y_name for y_name in y_names) for x_name in x_names]
+    rows = [tuple(x_name + y_name for x_name in x_names) for y_name in y_names]
+    options: List[Tuple[str, ...]] = []
     # horizontal locations
     for x_pos in range(board_size - ship_length + 1):
-        h_locations = [x_names[idx] for idx in range(x_pos, x_pos + ship_length)]
-        options.extend([[x_name + y_name for x_name in h_locations] for y_name in y_names])
+        options.extend([row[x_pos:x_pos + ship_length] for row in rows])
 
     if ship_length > 1:
         # vertical locations
         for y_pos in range(board_size - ship_length + 1):
-            v_locations = [y_names[idx] for idx in range(y_pos, y_pos + ship_length)]
-            options.extend([[x_name + y_name for y_name in v_locations] for x_name in x_names])
-    return options
+            options.extend([column[y_pos:y_pos + ship_length] for column in columns])
+    return tuple(options)
+
+
+# the board size is fixed, so the placement options are shared by all games
+_SHIP_LOCATIONS: Dict[int, Tuple[Tuple[str, ...], ...]] = {
+    length: get_possible_locations(length, 10) for length in (2, 3, 4, 5)
+}
+_SHOOT_LOCATIONS: Tuple[str, ...] = tuple(loc[0] for loc in get_possible_locations(1, 10))
+_SHOOT_LOCATIONS_SET: FrozenSet[str] = frozenset(_SHOOT_LOCATIONS)
+# one bit per board cell, 'A1' -> bit 0, 'A2' -> bit 1, ..., 'J10' -> bit 99
+_CELL_BIT: Dict[str, int] = {loc: 1 << idx for idx, loc in enumerate(_SHOOT_LOCATIONS)}
+
+
+def get_location_mask(locations: Iterable[str]) -> int:
+    # cells that are not on the 10x10 board have no bit and are left out
+    mask = 0
+    for loc in locations:
+        mask |= _CELL_BIT.get(loc, 0)
+    return mask
+
+
+# placement options of each ship length together with their cell masks
+_SHIP_MASKS: Dict[int, Tuple[Tuple[Tuple[str, ...], int], ...]] = {
+    length: tuple((loc, get_location_mask(loc)) for loc in locations)
+    for length, locations in _SHIP_LOCATIONS.items()
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def get_free_ship_locations(ship_length: int, busy_mask: int) -> Tuple[Tuple[str, ...], ...]:
+    # the same fleets come up again and again during setup (e.g. the first ship is always placed on
+    # an empty board), so the filtered placements are cached per ship length and occupied cells
+    return tuple(loc for loc, mask in _SHIP_MASKS[ship_length] if not mask & busy_mask)
+
+
+# board cells indexed by (is ship) + 2 * (was shot): empty, ship, miss, hit
+_BOARD_CELLS: Tuple[str, ...] = (
+    " - ",
+    Back.WHITE + " S " + Style.RESET_ALL,
+    Fore.CYAN + " O " + Style.RESET_ALL,
+    Fore.RED + Back.WHITE + Style.BRIGHT + " X " + Style.RESET_ALL,
+)
 
 
 def print_player_board(ships: List[Ship], enemy_shots: List[str], board_size: int = 10) -> None:
-    x_coords = list(string.ascii_uppercase)[:board_size]
-    y_coords = [str(y) for y in range(1, board_size + 1)]
+    x_coords, y_coords = get_coord_names(board_size)
     print("   " + "  ".join(x_coords) + " ")
-    ship_locations = [loc for ship in ships if ship.location is not None for loc in ship.location]
+    ship_locations = {loc for ship in ships if ship.location is not None for loc in ship.location}
+    enemy_shots_set = set(enemy_shots)
     for y_coord in y_coords:
-        y_string = f"{y_coord:>2}"
-        for x_coord in x_coords:
-            coordinate = x_coord + y_coord
-            if coordinate in ship_locations:
-                if coordinate in enemy_shots:
-                    y_string += Fore.RED + Back.WHITE + Style.BRIGHT + " X " + Style.RESET_ALL
-                else:
-                    y_string += Back.WHITE + " S " + Style.RESET_ALL
-            else:
-                if coordinate in enemy_shots:
-                    y_string += Fore.CYAN + " O " + Style.RESET_ALL
-                else:
-                    y_string += " - "
-        print(y_string)
+        row = [x_coord + y_coord for x_coord in x_coords]
+        cells = [_BOARD_CELLS[(cell in ship_locations) + 2 * (cell in enemy_shots_set)] for cell in row]
+        print(f"{y_coord:>2}" + "".join(cells))
 
 
 class Battleship(Game):
 
     def __init__(self) -> None:
         self.state = BattleshipGameState()
-        self.ship_locations: Dict[int, List[List[str]]] = {
-            2: get_possible_locations(2, 10),
-            3: get_possible_locations(3, 10),
-            4: get_possible_locations(4, 10),
-            5: get_possible_locations(5, 10)
-        }
-        self.shoot_locations: List[str] = [loc[0] for loc in get_possible_locations(1, 10)]
+        self.ship_locations: Dict[int, Tuple[Tuple[str, ...], ...]] = _SHIP_LOCATIONS
+        self.shoot_locations: Tuple[str, ...] = _SHOOT_LOCATIONS
+        self._action_cache_key: Optional[Tuple[Any, ...]] = None
+        self._action_cache_value: List[BattleshipAction] = []
 
     def get_state(self) -> BattleshipGameState:
         return self.state
 
     def set_state(self, state: BattleshipGameState) -> None:
         self.state = state
+        self._action_cache_key = None
 
     def print_state(self) -> None:
         #for idx in [0, 1]:
@@ -219,33 +251,48 @@ class Battleship(Game):
             print("--------------------------------\n")
 
     def get_ship_actions(self) -> List[BattleshipAction]:
-        busy_locations = set()
+        busy_mask = 0
         missing_ships = []
         for ship in self.state.get_player_ships(active_player=True):
             if ship.location is None:
                 missing_ships.append(ship)
             else:
-                busy_locations.update(ship.location)
+                busy_mask |= get_location_mask(ship.location)
         next_ship = missing_ships[0]
         actions = [
-            BattleshipAction(action_type=ActionType.SET_SHIP, ship_name=next_ship.name, location=loc)
-            for loc in self.ship_locations[next_ship.length]
-            if len(set(loc).intersection(busy_locations)) == 0
+            BattleshipAction(action_type=ActionType.SET_SHIP, ship_name=next_ship.name, location=list(loc))
+            for loc in get_free_ship_locations(next_ship.length, busy_mask)
             ]
         return actions
 
     def get_shoot_actions(self) -> List[BattleshipAction]:
-        loc_options = set(self.shoot_locations).difference(set(self.state.get_player_shots(active_player=True)))
+        loc_options = _SHOOT_LOCATIONS_SET.difference(self.state.get_player_shots(active_player=True))
         return [BattleshipAction(action_type=ActionType.SHOOT, location=[loc]) for loc in loc_options]
 
+    def get_action_cache_key(self) -> Tuple[Any, ...]:
+        ships = self.state.get_player_ships(active_player=True)
+        return (
+            self.state.phase,
+            self.state.idx_player_active,
+            tuple((ship.name, ship.length, tuple(ship.location) if ship.location else None) for ship in ships),
+            tuple(self.state.get_player_shots(active_player=True)),
+        )
+
     def get_list_action(self) -> List[BattleshipAction]:
-        if not self.state.all_ships_located():
-            return self.get_ship_actions()
-        if self.state.phase == GamePhase.FINISHED:
-            return []
-        return self.get_shoot_actions()
+        # the action list only depends on the active player's ships and shots
+        key = self.get_action_cache_key()
+        if key != self._action_cache_key:
+            if not self.state.all_ships_located():
+                self._action_cache_value = self.get_ship_actions()
+            elif self.state.phase == GamePhase.FINISHED:
+                self._action_cache_value = []
+            else:
+                self._action_cache_value = self.get_shoot_actions()
+            self._action_cache_key = key
+        return list(self._action_cache_value)
 
     def apply_action(self, action: BattleshipAction) -> None:
+        self._action_cache_key = None
         self.state.apply_action(action)
 
     def get_player_view(self, idx_player: int) -> BattleshipGameState:
@@ -257,23 +304,29 @@ class Battleship(Game):
 # pylint: disable = too-few-public-methods
 class RandomPlayer(Player):
 
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._rng = random.Random(seed)
+
     def select_action(self, state: BattleshipGameState, actions: List[BattleshipAction]) -> Optional[BattleshipAction]:
         """ Given masked game state and possible actions, select the next action """
         if len(actions) > 0:
-            return random.choice(actions)
+            return self._rng.choice(actions)
         return None
 
 
+@functools.lru_cache(maxsize=128)
+def _parse_loc(location: str) -> Tuple[int, int]:
+    return ord(location[0]), int(location[1:])
+
+
 class NotSoRandomPlayer(Player):
 
     last_action = None
     last_successfull_action = None
 
     def get_dist(self, a: BattleshipAction, b: BattleshipAction) -> float:
-        a_x = ord(a.location[0][0])
-        a_y = int(a.location[0][1:])
-        b_x = ord(b.location[0][0])
-        b_y = int(b.location[0][1:])
+        a_x, a_y = _parse_loc(a.location[0])
+        b_x, b_y = _parse_loc(b.location[0])
         if a_x != b_x and a_y != b_y:
             return 100
         return abs(a_x - b_x) + abs(a_y - b_y)
@@ -288,14 +341,9 @@ class NotSoRandomPlayer(Player):
             if self.last_action is not None and self.last_action.location[0] in player.successful_shots:
                 self.last_successfull_action = self.last_action
             if self.last_successfull_action is not None:
-                d_min = None
-                a_min = None
-                for action in actions:
-                    d = self.get_dist(self.last_successfull_action, action)
-                    if d_min is None or d_min > d:
-                        d_min = d
-                        a_min = action
-                action_selected = a_min
+                if len(actions) > 0:
+                    action_selected = min(
+                        actions, key=functools.partial(self.get_dist, self.last_successfull_action))
             else:
                 if len(actions) > 0:
                     action_selected = random.choice(actions)
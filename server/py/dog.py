@@ -1,18 +1,29 @@
 from __future__ import annotations  # Enables forward references for type hints
 
+import functools
+import itertools
+import os
 import random
-from collections import Counter
 from enum import Enum
 from typing import (
-    Any, ClassVar, Dict, List, Optional, Set, cast
+    Any, ClassVar, Dict, Iterable, List, Optional, Set, Tuple, cast
 )
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from server.py.game import Game, Player
 
 
 
+# progress messages are only printed when DOG_DEBUG is set, as printing slows down the game loop
+DEBUG = bool(os.environ.get("DOG_DEBUG"))
+
+
+def log(message: str) -> None:
+    if DEBUG:
+        print(message)
+
+
 class Card(BaseModel):
     suit: str
     rank: str
@@ -23,6 +34,9 @@ class Card(BaseModel):
         return str(self) < str(other)
 
     def __eq__(self, other: object) -> bool:
+        # cards are mostly compared with themselves (they all come from the same deck)
+        if self is other:
+            return True
         if not isinstance(other, Card):
             return NotImplemented
         return self.suit == other.suit and self.rank == other.rank
@@ -46,6 +60,9 @@ class PlayerState(BaseModel):
 
 
 class Action(BaseModel):
+    # actions are shared between games through make_action, so they must not be changed
+    model_config = ConfigDict(frozen=True)
+
     card: Card
     pos_from: Optional[int] = None
     pos_to: Optional[int] = None
@@ -77,36 +94,14 @@ class GameState(BaseModel):
         '2', '3', '4', '5', '6', '7', '8', '9', '10',
         'J', 'Q', 'K', 'A', 'JKR'
     ]
-    LIST_CARD: ClassVar[List[Card]] = [
-        Card(suit='♠', rank='2'), Card(suit='♥', rank='2'),
-        Card(suit='♦', rank='2'), Card(suit='♣', rank='2'),
-        Card(suit='♠', rank='3'), Card(suit='♥', rank='3'),
-        Card(suit='♦', rank='3'), Card(suit='♣', rank='3'),
-        Card(suit='♠', rank='4'), Card(suit='♥', rank='4'),
-        Card(suit='♦', rank='4'), Card(suit='♣', rank='4'),
-        Card(suit='♠', rank='5'), Card(suit='♥', rank='5'),
-        Card(suit='♦', rank='5'), Card(suit='♣', rank='5'),
-        Card(suit='♠', rank='6'), Card(suit='♥', rank='6'),
-        Card(suit='♦', rank='6'), Card(suit='♣', rank='6'),
-        Card(suit='♠', rank='7'), Card(suit='♥', rank='7'),
-        Card(suit='♦', rank='7'), Card(suit='♣', rank='7'),
-        Card(suit='♠', rank='8'), Card(suit='♥', rank='8'),
-        Card(suit='♦', rank='8'), Card(suit='♣', rank='8'),
-        Card(suit='♠', rank='9'), Card(suit='♥', rank='9'),
-        Card(suit='♦', rank='9'), Card(suit='♣', rank='9'),
-        Card(suit='♠', rank='10'), Card(suit='♥', rank='10'),
-        Card(suit='♦', rank='10'), Card(suit='♣', rank='10'),
-        Card(suit='♠', rank='J'), Card(suit='♥', rank='J'),
-        Card(suit='♦', rank='J'), Card(suit='♣', rank='J'),
-        Card(suit='♠', rank='Q'), Card(suit='♥', rank='Q'),
-        Card(suit='♦', rank='Q'), Card(suit='♣', rank='Q'),
-        Card(suit='♠', rank='K'), Card(suit='♥', rank='K'),
-        Card(suit='♦', rank='K'), Card(suit='♣', rank='K'),
-        Card(suit='♠', rank='A'), Card(suit='♥', rank='A'),
-        Card(suit='♦', rank='A'), Card(suit='♣', rank='A'),
-        Card(suit='', rank='JKR'), Card(suit='', rank='JKR'),
-        Card(suit='', rank='JKR')
-    ] * 2
+    # every suit of every rank (in rank order), then the three jokers; the deck is used twice
+    LIST_CARD: ClassVar[List[Card]] = (
+        [
+            Card(suit=suit, rank=rank)
+            for rank, suit in itertools.product(LIST_RANK[:-1], LIST_SUIT)
+        ]
+        + [Card(suit='', rank='JKR') for _ in range(3)]
+    ) * 2
 
     cnt_player: int = 4
     phase: GamePhase
@@ -120,26 +115,87 @@ class GameState(BaseModel):
     card_active: Optional[Card]
 
 
+# immutable copy of the full deck, used to (re)fill the draw pile
+FULL_DECK: Tuple[Card, ...] = tuple(GameState.LIST_CARD)
+
+# first kennel and first finish position of each player, the board layout is fixed for 4 players
+KENNEL_START: Tuple[int, ...] = tuple(64 + 8 * idx for idx in range(4))
+FINISH_START: Tuple[int, ...] = tuple(68 + 8 * idx for idx in range(4))
+
+# number of steps of the cards that only move forward
+FORWARD_MOVE_STEPS: Dict[str, int] = {
+    '2': 2, '3': 3, '5': 5, '6': 6, '8': 8, '9': 9, '10': 10
+}
+# per card, the bitmask of the positions passed when moving forward from each board position
+# (only positions from which the move stays on the board, i.e. ends at 63 at most)
+FORWARD_MOVE_PATH_MASKS: Dict[str, Tuple[int, ...]] = {
+    rank: tuple(
+        ((1 << steps) - 1) << (pos + 1) for pos in range(64 - steps)
+    )
+    for rank, steps in FORWARD_MOVE_STEPS.items()
+}
+
+# one shared card object per (suit, rank), taken from the deck, so comparing them with
+# cards in play usually ends at the identity check
+CARD_BY_KEY: Dict[Tuple[str, str], Card] = {}
+for _card in FULL_DECK:
+    CARD_BY_KEY.setdefault((_card.suit, _card.rank), _card)
+
+# cards a joker can stand for, at the beginning (only start cards) and later in the game
+JOKER_SWAPS_START: Tuple[Card, ...] = tuple(
+    CARD_BY_KEY[(suit, rank)]
+    for suit in GameState.LIST_SUIT for rank in ['A', 'K']
+)
+JOKER_SWAPS_FULL: Tuple[Card, ...] = tuple(
+    CARD_BY_KEY[(suit, rank)]
+    for suit in GameState.LIST_SUIT for rank in GameState.LIST_RANK
+    if rank != 'JKR'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def make_action(
+    card: Card, pos_from: Optional[int] = None, pos_to: Optional[int] = None,
+    card_swap: Optional[Card] = None
+) -> Action:
+    """
+    Return the (shared) action for the given values. The set of possible actions is small,
+    so they are created once and reused by every action list.
+    """
+    return Action(
+        card=card, pos_from=pos_from, pos_to=pos_to, card_swap=card_swap
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def get_joker_swap_actions(card: Card, is_beginning_phase: bool) -> Tuple[Action, ...]:
+    """ all swap actions of a joker, they only depend on the game phase """
+    swap_cards = JOKER_SWAPS_START if is_beginning_phase else JOKER_SWAPS_FULL
+    return tuple(make_action(card=card, card_swap=card_swap) for card_swap in swap_cards)
+
+
 class Dog(Game):
     state: GameState
 
     def __init__(self) -> None:
         self.steps_remaining: Optional[int] = None
-        self.seven_card_backup: Optional[Dict[str, Any]] = None
+        # marbles moved by the SEVEN being played, with their previous (pos, is_save)
+        self.seven_card_undo: Optional[List[Tuple[Marble, int, bool]]] = None
         self.card_exchange_buffer: List[Optional[Card]] = [
             None, None, None, None
         ]
+        self._action_cache: Dict[Tuple[Any, ...], List[Action]] = {}
 
         self.reset()
 
     def reset(self) -> None:
-        draw_pile: List[Card] = list(GameState.LIST_CARD)
+        draw_pile: List[Card] = list(FULL_DECK)
         random.shuffle(draw_pile)
 
         players: List[PlayerState] = []
         for i in range(4):
             marbles: List[Marble] = [
-                Marble(pos=(64 + i * 8 + j), is_save=j == 0)
+                Marble(pos=(KENNEL_START[i] + j), is_save=j == 0)
                 for j in range(4)
             ]
             player_cards: List[Card] = draw_pile[:6]
@@ -174,28 +230,44 @@ class Dog(Game):
     def print_state(self) -> None:
         pass
 
+    def get_save_mask(self) -> int:
+        """ bitmask of the positions occupied by save marbles (bit n = position n) """
+        save_mask = 0
+        for player in self.state.list_player:
+            for m in player.list_marble:
+                if m.is_save:
+                    save_mask |= 1 << m.pos
+        return save_mask
+
     def is_path_blocked(self, start: int, end: int) -> bool:
-        step = 1 if end > start else -1
-        for pos in range(start + step, end + step, step):
-            for player in self.state.list_player:
-                for m in player.list_marble:
-                    if m.pos == pos and m.is_save:
-                        return True
-        return False
+        # the path covers the positions after start up to and including end
+        if end > start:
+            path_mask = ((1 << (end - start)) - 1) << (start + 1)
+        else:
+            path_mask = ((1 << (start - end)) - 1) << end
+        return self.get_save_mask() & path_mask != 0
 
     def fold_cards(self, player: PlayerState) -> None:
         self.state.list_card_discard.extend(player.list_card)
         player.list_card.clear()
-        print(f"{player.name} folded their cards.")
+        log(f"{player.name} folded their cards.")
         self._finalize_turn()
 
     def _send_marble_home(self, marble: Marble) -> None:
+        self._record_seven_card_move(marble)
         owner_idx = self._get_marble_owner(marble)
-        kennel_start = 64 + owner_idx * 8
+        kennel_start = KENNEL_START[owner_idx]
         marble.pos = kennel_start
         marble.is_save = False
 
     def _get_marble_owner(self, marble: Marble) -> int:
+        # marbles are passed around by reference, so an identity check is enough in almost
+        # all cases and avoids the pydantic __eq__ for every marble on the board
+        for i, player in enumerate(self.state.list_player):
+            for m in player.list_marble:
+                if m is marble:
+                    return i
+        # fall back to value equality for copies of a marble
         for i, player in enumerate(self.state.list_player):
             if marble in player.list_marble:
                 return i
@@ -203,10 +275,13 @@ class Dog(Game):
 
     def is_player_finished(self, player_idx: int) -> bool:
         player = self.state.list_player[player_idx]
-        start_finish = 68 + 8 * player_idx
-        return all(
-            start_finish <= m.pos <= start_finish + 3 for m in player.list_marble
-        )
+        start_finish = FINISH_START[player_idx]
+        end_finish = start_finish + 3
+        # plain loop with early exit, mostly the first marble is not in the finish yet
+        for m in player.list_marble:
+            if not start_finish <= m.pos <= end_finish:
+                return False
+        return True
 
     def get_partner_index(self, player_idx: int) -> int:
         return (player_idx + 2) % self.state.cnt_player
@@ -233,18 +308,52 @@ class Dog(Game):
     def _find_marble_by_pos(
         self, marbles: List[Marble], pos: int
     ) -> Optional[Marble]:
-        return next((m for m in marbles if m.pos == pos), None)
+        # plain loops instead of next() over a generator: no generator frame per lookup
+        for m in marbles:
+            if m.pos == pos:
+                return m
+        return None
+
+    def get_action_cache_key(self) -> Tuple[Any, ...]:
+        state = self.state
+        active_player = state.list_player[state.idx_player_active]
+        return (
+            state.idx_player_active,
+            state.bool_card_exchanged,
+            state.cnt_round == 0,
+            (state.card_active.suit, state.card_active.rank) if state.card_active else None,
+            tuple((c.suit, c.rank) for c in active_player.list_card),
+            tuple(
+                (m.pos, m.is_save) for player in state.list_player
+                for m in player.list_marble
+            ),
+        )
 
     def get_list_action(self) -> List[Action]:
-        actions: Set[Action] = set()
+        # the key covers everything the actions depend on, so it stays valid even when
+        # the state is modified directly instead of through apply_action
+        key = self.get_action_cache_key()
+        actions = self._action_cache.get(key)
+        if actions is None:
+            if len(self._action_cache) >= 1024:
+                self._action_cache.clear()
+            actions = self._action_cache[key] = self._generate_list_action()
+        return list(actions)
+
+    def _generate_list_action(self) -> List[Action]:
+        actions: List[Action] = []
         active_player = self.state.list_player[self.state.idx_player_active]
 
         if not self.state.bool_card_exchanged and self.state.cnt_round == 0:
             for c in active_player.list_card:
-                actions.add(Action(card=c, pos_from=None, pos_to=None))
-            return list(actions)
+                actions.append(make_action(card=c, pos_from=None, pos_to=None))
+            return list(dict.fromkeys(actions))
 
-        marbles_to_consider = self.get_active_and_partner_marbles()
+        # derive the own (and partner) players once, the marbles follow from them
+        own_playerstates = self.get_active_and_partner_playerstates()
+        marbles_to_consider = [
+            m for player in own_playerstates for m in player.list_marble
+        ]
         cards = active_player.list_card if not self.state.card_active else [
             self.state.card_active
         ]
@@ -252,38 +361,44 @@ class Dog(Game):
             marble.pos >= 64 for marble in active_player.list_marble
         )
 
-        for card in cards:
+        # a second copy of the same card would only generate the same actions again
+        for card in dict.fromkeys(cards):
             if card.rank == 'JKR':
-                actions.update(
+                actions.extend(
                     self._generate_joker_actions(
                         active_player, card, is_beginning_phase, marbles_to_consider
                     )
                 )
             elif card.rank in ['A', 'K']:
-                actions.update(
+                actions.extend(
                     self._generate_start_card_actions(
                         active_player, card, marbles_to_consider
                     )
                 )
             elif card.rank == 'J':
-                actions.update(
+                actions.extend(
                     self._generate_jack_card_actions(
-                        active_player, card, marbles_to_consider
+                        active_player, card, marbles_to_consider,
+                        own_playerstates
                     )
                 )
-            elif card.rank in {'2', '3', '5', '6', '8', '9', '10'}:
-                actions.update(
+            elif card.rank in FORWARD_MOVE_STEPS:
+                actions.extend(
                     self._generate_forward_move_actions(
                         active_player, card, marbles_to_consider
                     )
                 )
-        return list(actions)
+        # drop duplicates (e.g. from marbles sharing a kennel position) once, keeping the first occurrence
+        return list(dict.fromkeys(actions))
 
     def _find_duplicate_actions(self, actions: List[Action]) -> None:
-        action_counter = Counter(actions)
-        duplicates = [
-            action for action, count in action_counter.items() if count > 1
-        ]
+        seen: Set[Action] = set()
+        duplicates: Dict[Action, None] = {}  # keeps each duplicate once, in order
+        for action in actions:
+            if action in seen:
+                duplicates[action] = None
+            else:
+                seen.add(action)
         if duplicates:
             print("Duplicate actions found:")
             for action in duplicates:
@@ -298,25 +413,10 @@ class Dog(Game):
         for marble in marbles_to_consider:
             if marble.pos == 64:
                 actions.append(
-                    Action(card=card, pos_from=64, pos_to=0)
+                    make_action(card=card, pos_from=64, pos_to=0)
                 )
 
-        if is_beginning_phase:
-            for suit in GameState.LIST_SUIT:
-                for rank in ['A', 'K']:
-                    actions.append(
-                        Action(card=card, card_swap=Card(suit=suit, rank=rank))
-                    )
-        else:
-            for suit in GameState.LIST_SUIT:
-                for rank in GameState.LIST_RANK:
-                    if rank != 'JKR':
-                        actions.append(
-                            Action(
-                                card=card,
-                                card_swap=Card(suit=suit, rank=rank)
-                            )
-                        )
+        actions.extend(get_joker_swap_actions(card, is_beginning_phase))
         return actions
 
 
@@ -328,7 +428,7 @@ class Dog(Game):
         for marble in marbles_to_consider:
             if marble.pos == 64:
                 actions.append(
-                    Action(
+                    make_action(
                         card=card,
                         pos_from=64,
                         pos_to=0,
@@ -340,7 +440,7 @@ class Dog(Game):
                 target_pos = marble.pos + 1
                 if target_pos <= 63:
                     actions.append(
-                        Action(
+                        make_action(
                             card=card,
                             pos_from=marble.pos,
                             pos_to=target_pos
@@ -350,41 +450,32 @@ class Dog(Game):
 
     def _generate_jack_card_actions(
         self, _active_player: PlayerState, card: Card,
-        marbles_to_consider: List[Marble]
+        marbles_to_consider: List[Marble],
+        own_playerstates: Optional[List[PlayerState]] = None
     ) -> List[Action]:
         actions = []
-        found_valid_target = False
+        own_positions = [m.pos for m in marbles_to_consider if m.pos < 64]
+        if own_playerstates is None:
+            own_playerstates = self.get_active_and_partner_playerstates()
+        own_ids = {id(player) for player in own_playerstates}
+        # positions of the opponent marbles that can be swapped with, collected once
+        # instead of for every own marble
+        target_positions = [
+            opp_marble.pos
+            for opponent in self.state.list_player
+            if id(opponent) not in own_ids
+            for opp_marble in opponent.list_marble
+            if not opp_marble.is_save and opp_marble.pos < 64
+        ]
 
-        # Check actions with opponent marbles
-        for marble in marbles_to_consider:
-            if marble.pos >= 64:  # Skip marbles already home
-                continue
-            for opponent in self.state.list_player:
-                if opponent in self.get_active_and_partner_playerstates():
-                    continue
-                for opp_marble in opponent.list_marble:
-                    if opp_marble.is_save or opp_marble.pos >= 64:
-                        continue
-                    # Valid target found
-                    found_valid_target = True
-                    actions.append(Action(
-                        card=card, pos_from=marble.pos, pos_to=opp_marble.pos
-                    ))
-                    actions.append(Action(
-                        card=card, pos_from=opp_marble.pos, pos_to=marble.pos
-                    ))
-
-        # If no valid targets, generate fallback actions
-        if not found_valid_target:
-            marbles_on_board = [m for m in marbles_to_consider if m.pos < 64]
-            for i, marble_a in enumerate(marbles_on_board):
-                for marble_b in marbles_on_board[i + 1:]:
-                    actions.append(Action(
-                        card=card, pos_from=marble_a.pos, pos_to=marble_b.pos
-                    ))
-                    actions.append(Action(
-                        card=card, pos_from=marble_b.pos, pos_to=marble_a.pos
-                    ))
+        # swap with an opponent marble if there is one, otherwise (fallback) between own marbles
+        if own_positions and target_positions:
+            pairs: Iterable[Tuple[int, int]] = itertools.product(own_positions, target_positions)
+        else:
+            pairs = itertools.combinations(own_positions, 2)
+        for pos_a, pos_b in pairs:
+            actions.append(make_action(card=card, pos_from=pos_a, pos_to=pos_b))
+            actions.append(make_action(card=card, pos_from=pos_b, pos_to=pos_a))
 
         return actions
 
@@ -394,23 +485,21 @@ class Dog(Game):
         marbles_to_consider: List[Marble]
     ) -> List[Action]:
         actions = []
-        forward_move_cards = {
-            '2': 2, '3': 3, '5': 5, '6': 6, '8': 8, '9': 9, '10': 10
-        }
-        steps = forward_move_cards[card.rank]
+        steps = FORWARD_MOVE_STEPS[card.rank]
+        path_masks = FORWARD_MOVE_PATH_MASKS[card.rank]
+        # the board does not change while the moves are generated
+        save_mask = self.get_save_mask()
 
         for marble in marbles_to_consider:
-            if 0 <= marble.pos < 64:
-                target_pos = marble.pos + steps
-                if target_pos <= 63:
-                    if not self.is_path_blocked(marble.pos, target_pos):
-                        actions.append(
-                            Action(
-                                card=card,
-                                pos_from=marble.pos,
-                                pos_to=target_pos
-                            )
+            if 0 <= marble.pos < len(path_masks):
+                if not save_mask & path_masks[marble.pos]:
+                    actions.append(
+                        make_action(
+                            card=card,
+                            pos_from=marble.pos,
+                            pos_to=marble.pos + steps
                         )
+                    )
         return actions
 
     def apply_action(self, action: Optional[Action]) -> None:
@@ -418,13 +507,12 @@ class Dog(Game):
 
         if not self.state.bool_card_exchanged and self.state.cnt_round == 0:
             active_player = self.state.list_player[self.state.idx_player_active]
-            if action is None or action.card not in active_player.list_card:
-                print(
+            if action is None or not self._remove_card(active_player, action.card):
+                log(
                     "Invalid action: Card exchange requires choosing one of your cards."
                 )
                 return
             chosen_card = action.card
-            active_player.list_card.remove(chosen_card)
             self.card_exchange_buffer[self.state.idx_player_active] = chosen_card
             self.state.idx_player_active = (
                 self.state.idx_player_active + 1
@@ -444,14 +532,9 @@ class Dog(Game):
 
             return
 
-        if not self.state.list_card_draw:
-            self.reshuffle_cards()
-
         active_player_idx = self.state.idx_player_active
         active_player = self.state.list_player[active_player_idx]
 
-        marbles_to_consider = self.get_active_and_partner_marbles()
-
         if action is None:
             self._handle_no_action(active_player)
             return
@@ -462,17 +545,17 @@ class Dog(Game):
             if action.card_swap:
                 active_player.list_card.remove(action.card)
                 self.state.card_active = action.card_swap
-                print(
+                log(
                     f"JOKER played: Active card is now {self.state.card_active}."
                 )
                 return
         elif action.card.rank == 'J':
             self._handle_jack_card_in_apply(
-                action, active_player, marbles_to_consider
+                action, active_player, self.get_active_and_partner_marbles()
             )
         else:
             self._handle_normal_card_in_apply(
-                action, active_player, marbles_to_consider
+                action, active_player, self.get_active_and_partner_marbles()
             )
 
         if self.steps_remaining is None:
@@ -480,6 +563,15 @@ class Dog(Game):
 
         self.check_and_handle_victory()
 
+    @staticmethod
+    def _remove_card(player: PlayerState, card: Card) -> bool:
+        """ remove the card from the hand with a single scan, return False if it isn't there """
+        try:
+            player.list_card.remove(card)
+        except ValueError:
+            return False
+        return True
+
     def _ensure_cards_available(self) -> None:
         if not self.state.list_card_draw:
             self.reshuffle_cards()
@@ -512,9 +604,8 @@ class Dog(Game):
         ) if action.pos_to is not None else None
 
         if not opponent_marble and action.pos_to is not None:
-            opponent_marble = next(
-                (m for m in marbles_to_consider if m.pos == action.pos_to),
-                None
+            opponent_marble = self._find_marble_by_pos(
+                marbles_to_consider, action.pos_to
             )
 
         if moving_marble and opponent_marble:
@@ -531,20 +622,17 @@ class Dog(Game):
         ) if action.pos_from is not None else None
 
         if moving_marble:
+            # kennel and finish positions (64+) belong to a single player, so only the
+            # own marbles below can be there and the scan over all players is skipped
             opponent_marble = self._get_marble_at_position_of_opponent(
                 action.pos_to
-            ) if action.pos_to is not None else None
+            ) if action.pos_to is not None and action.pos_to < 64 else None
 
             if not opponent_marble and action.pos_to is not None:
-                partner_marble = next(
-                    (
-                        m for m in marbles_to_consider
-                        if m.pos == action.pos_to and m != moving_marble
-                    ),
-                    None
-                )
-                if partner_marble:
-                    opponent_marble = partner_marble
+                for m in marbles_to_consider:
+                    if m.pos == action.pos_to and m != moving_marble:
+                        opponent_marble = m
+                        break
 
             if opponent_marble:
                 self._send_marble_home(opponent_marble)
@@ -570,7 +658,9 @@ class Dog(Game):
                 self.state.list_card_discard.clear()
                 random.shuffle(self.state.list_card_draw)
             else:
-                self.state.list_card_draw = list(GameState.LIST_CARD)
+                # refill the draw pile in place, so references to it stay valid
+                self.state.list_card_draw.clear()
+                self.state.list_card_draw.extend(FULL_DECK)
                 random.shuffle(self.state.list_card_draw)
                 self.state.list_card_discard.clear()
 
@@ -585,7 +675,7 @@ class Dog(Game):
             total_cards += len(player.list_card)
 
     def _handle_no_action(self, active_player: PlayerState) -> None:
-        print("No action provided; skipping turn or reshuffling cards.")
+        log("No action provided; skipping turn or reshuffling cards.")
         if (
             self.state.card_active
             and self.state.card_active.rank == '7'
@@ -605,7 +695,7 @@ class Dog(Game):
         if self.steps_remaining is None:
             self.steps_remaining = 7
             self.state.card_active = action.card
-            self.seven_card_backup = self._create_seven_card_backup()
+            self.seven_card_undo = []
 
         steps_used = self._calculate_steps_used(action)
         if steps_used > self.steps_remaining:
@@ -619,6 +709,7 @@ class Dog(Game):
             self._handle_intermediate_positions(
                 action, moving_marble, active_player
             )
+            self._record_seven_card_move(moving_marble)
             moving_marble.pos = action.pos_to
             self.steps_remaining -= steps_used
 
@@ -626,7 +717,7 @@ class Dog(Game):
                 self.steps_remaining = None
                 self.state.card_active = None
                 active_player.list_card.remove(action.card)
-                self.seven_card_backup = None
+                self.seven_card_undo = None
 
     def _handle_joker_card(
         self, action: Action, active_player: PlayerState
@@ -635,38 +726,6 @@ class Dog(Game):
             self.state.card_active = action.card_swap
             active_player.list_card.remove(action.card)
 
-    def _handle_jack_card(
-        self, action: Action, active_player: PlayerState
-    ) -> None:
-        moving_marble = self._get_marble_at_position(
-            active_player, action.pos_from
-        ) if action.pos_from is not None else None
-
-        opponent_marble = self._get_marble_at_position_of_opponent(
-            action.pos_to
-        ) if action.pos_to is not None else None
-
-        if moving_marble and opponent_marble:
-            moving_marble.pos, opponent_marble.pos = (
-                opponent_marble.pos, moving_marble.pos
-            )
-
-    def _handle_normal_card(
-        self, action: Action, active_player: PlayerState
-    ) -> None:
-        moving_marble = self._get_marble_at_position(
-            active_player, action.pos_from
-        ) if action.pos_from is not None else None
-
-        if moving_marble and action.pos_to is not None:
-            opponent_marble = self._get_marble_at_position_of_opponent(
-                action.pos_to
-            )
-            if opponent_marble:
-                self._send_marble_home(opponent_marble)
-            moving_marble.pos = action.pos_to
-            moving_marble.is_save = True
-
     def _finalize_turn(self) -> None:
         self.state.card_active = None
         self.state.idx_player_active = (
@@ -678,57 +737,58 @@ class Dog(Game):
 
     def start_new_round(self) -> None:
         self._handle_round_completion()
-        print(f"Round {self.state.cnt_round} started.")
+        log(f"Round {self.state.cnt_round} started.")
 
     def _calculate_steps_used(self, action: Action) -> int:
         pos_from = action.pos_from
         pos_to = action.pos_to
-        player_idx = self.state.idx_player_active
-        start_pos = 16 * player_idx
-        finish_start = 68 + 8 * player_idx
-
         if pos_from is None or pos_to is None:
             return 0
 
-        if pos_from < 64 and pos_to < 64:
-            return (pos_to - pos_from) % 64
-
-        if pos_from < 64 and pos_to >= finish_start:
-            steps_on_board = (start_pos - pos_from) % 64
-            steps_in_finish = (pos_to - finish_start) + 1
-            return steps_on_board + steps_in_finish
-
-        if pos_from >= 64 and pos_to >= 64:
-            return abs(pos_to - pos_from)
+        # most steps stay on the board, so check that case first
+        if pos_from < 64:
+            if pos_to < 64:
+                steps = pos_to - pos_from
+                return steps if steps >= 0 else steps + 64
+            player_idx = self.state.idx_player_active
+            finish_start = FINISH_START[player_idx]
+            if pos_to >= finish_start:
+                steps_on_board = (16 * player_idx - pos_from) % 64
+                steps_in_finish = (pos_to - finish_start) + 1
+                return steps_on_board + steps_in_finish
 
         return abs(pos_to - pos_from)
 
 
     def _handle_intermediate_positions(
         self, action: Action, moving_marble: Marble,
-        active_player: PlayerState
+        _active_player: PlayerState
     ) -> None:
         if action.pos_from is not None and action.pos_to is not None:
+            # look up the marbles by position once instead of scanning all of them per step;
+            # this covers opponent, partner and own marbles alike
+            marble_at_pos = self._get_marble_index()
             for pos in range(action.pos_from + 1, action.pos_to + 1):
-                opponent_marble = self._get_marble_at_position_of_opponent(pos)
-                if opponent_marble:
-                    self._send_marble_home(opponent_marble)
+                marble = marble_at_pos.get(pos)
+                if marble is not None and marble is not moving_marble:
+                    self._send_marble_home(marble)
                     break
 
-                own_marble = self._get_marble_at_position(
-                    active_player, pos
-                )
-                if own_marble and own_marble != moving_marble:
-                    self._send_marble_home(own_marble)
-                    break
+    def _get_marble_index(self) -> Dict[int, Marble]:
+        """ map each occupied position to its marble (the first one for shared kennel positions) """
+        marble_at_pos: Dict[int, Marble] = {}
+        for player in self.state.list_player:
+            for m in player.list_marble:
+                marble_at_pos.setdefault(m.pos, m)
+        return marble_at_pos
 
     def _get_marble_at_position(
         self, player: PlayerState, position: int
     ) -> Optional[Marble]:
-        return next(
-            (m for m in player.list_marble if m.pos == position),
-            None
-        )
+        for m in player.list_marble:
+            if m.pos == position:
+                return m
+        return None
 
     def _get_marble_at_position_of_opponent(
         self, position: Optional[int]
@@ -751,7 +811,7 @@ class Dog(Game):
 
         self.reshuffle_cards(cards_per_player)
         self._deal_cards(cards_per_player)
-        print(f"Round {self.state.cnt_round} started with {cards_per_player} cards per player.")
+        log(f"Round {self.state.cnt_round} started with {cards_per_player} cards per player.")
 
     def _calculate_cards_per_round(self) -> int:
         if 1 <= self.state.cnt_round <= 5:
@@ -759,22 +819,27 @@ class Dog(Game):
         return 7 - ((self.state.cnt_round - 1) % 5 + 1)
 
     def _deal_cards(self, cards_per_player: int) -> None:
+        if cards_per_player <= 0:
+            return
         self.reshuffle_cards(cards_per_player)
         draw_pile = self.state.list_card_draw
         for player in self.state.list_player:
-            for _ in range(cards_per_player):
-                if not draw_pile:
-                    self.reshuffle_cards(cards_per_player)
-                card = draw_pile.pop()
-                player.list_card.append(card)
-        self.state.list_card_draw = draw_pile
+            if len(draw_pile) < cards_per_player:
+                self.reshuffle_cards(cards_per_player)
+            # deal from the top (end) of the pile, in the same order as popping one by one
+            player.list_card.extend(reversed(draw_pile[-cards_per_player:]))
+            del draw_pile[-cards_per_player:]
 
     def check_victory(self) -> Optional[str]:
         if self.state.phase == GamePhase.FINISHED:
             return "Game already finished"
 
         for player in self.state.list_player:
-            if all(76 <= marble.pos <= 95 for marble in player.list_marble):
+            # stop at the first marble outside of positions 76..95
+            for marble in player.list_marble:
+                if not 76 <= marble.pos <= 95:
+                    break
+            else:
                 self.state.phase = GamePhase.FINISHED
                 return f"Player {player.name} has won!"
 
@@ -807,33 +872,21 @@ class Dog(Game):
             card_active=self.state.card_active,
         )
 
-    def _create_seven_card_backup(self) -> Dict[str, Any]:
-        return {
-            'marbles': [
-                (player_idx, marble_idx, marble.pos, marble.is_save)
-                for player_idx, p in enumerate(self.state.list_player)
-                for marble_idx, marble in enumerate(p.list_marble)
-            ],
-            'card_hands': [
-                (player_idx, list(p.list_card))
-                for player_idx, p in enumerate(self.state.list_player)
-            ],
-            'card_active': self.state.card_active,
-            'steps_remaining': self.steps_remaining,
-            'idx_player_active': self.state.idx_player_active,
-        }
+    def _record_seven_card_move(self, marble: Marble) -> None:
+        """ remember the old place of a marble moved during a SEVEN, so it can be undone """
+        if self.seven_card_undo is not None:
+            self.seven_card_undo.append((marble, marble.pos, marble.is_save))
 
     def _restore_seven_card_backup(self) -> None:
-        if not self.seven_card_backup:
+        if self.seven_card_undo is None:
             return
-        for player_idx, card_list in self.seven_card_backup['card_hands']:
-            self.state.list_player[player_idx].list_card = card_list
-        for player_idx, marble_idx, pos, is_save in self.seven_card_backup['marbles']:
-            self.state.list_player[player_idx].list_marble[marble_idx].pos = pos
-            self.state.list_player[player_idx].list_marble[marble_idx].is_save = is_save
+        # undo the moves in reverse order, so every marble ends up at its first recorded place
+        for marble, pos, is_save in reversed(self.seven_card_undo):
+            marble.pos = pos
+            marble.is_save = is_save
         self.state.card_active = None
         self.steps_remaining = None
-        self.seven_card_backup = None
+        self.seven_card_undo = None
 
 
 class RandomPlayer(Player):
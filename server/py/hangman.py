@@ -107,8 +107,8 @@ class Hangman(Game):
     def get_list_action(self) -> List[GuessLetterAction]:
         if self.state.phase == GamePhase.FINISHED:
             return []
-        all_letters = string.ascii_uppercase
-        return [GuessLetterAction(letter=letter) for letter in all_letters if letter not in self.state.guesses]
+        guessed = set(self.state.guesses)
+        return [GuessLetterAction(letter=letter) for letter in string.ascii_uppercase if letter not in guessed]
 
     def apply_action(self, action: GuessLetterAction) -> None:
         if self.state.phase == GamePhase.FINISHED:
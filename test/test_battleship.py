@@ -0,0 +1,38 @@
+# tests/test_battleship.py
+
+from server.py.battleship import Battleship, ActionType
+
+
+def test_list_action_follows_direct_state_changes():
+    """The cached action list must reflect changes made to the state without set_state."""
+    game = Battleship()
+    ship = game.state.get_player_ships(active_player=True)[0]
+    actions = game.get_list_action()
+    assert all(len(action.location) == ship.length for action in actions)
+
+    ship.length = 2
+    actions = game.get_list_action()
+    assert actions and all(len(action.location) == 2 for action in actions)
+
+
+def test_list_action_is_not_affected_by_changes_to_the_returned_list():
+    game = Battleship()
+    actions = game.get_list_action()
+    expected = len(actions)
+    actions.clear()
+    assert len(game.get_list_action()) == expected
+
+
+def test_shoot_actions_follow_replaced_shots():
+    game = Battleship()
+    while game.state.phase.value == 'setup':
+        game.apply_action(game.get_list_action()[0])
+    me = game.state.players[game.state.idx_player_active]
+    me.shots = ['A1']
+    locations = {action.location[0] for action in game.get_list_action()}
+    assert 'A1' not in locations and 'B2' in locations
+
+    me.shots = ['B2']
+    locations = {action.location[0] for action in game.get_list_action()}
+    assert 'A1' in locations and 'B2' not in locations
+    assert all(action.action_type == ActionType.SHOOT for action in game.get_list_action())
@@ -1,6 +1,7 @@
 # tests/test_dog.py
 
 import pytest
+from pydantic import ValidationError
 from server.py.dog import Dog, Card, Marble, PlayerState, Action, GameState, GamePhase
 from server.py.dog import RandomPlayer, GameState, Action, Card
 from typing import List, Any
@@ -638,4 +639,54 @@ def test_intermediate_positions_with_block():
     # The opponent marble at 63 should be sent home
     kennel_start = 64 + 1 * 8
     assert opponent_player.list_marble[0].pos == kennel_start
-    assert active_player.list_marble[0].pos == 67    
\ No newline at end of file
+    assert active_player.list_marble[0].pos == 67    
+def test_list_action_follows_direct_state_changes(game_instance):
+    # the action list is cached, the cache must notice changes made without set_state
+    state = game_instance.get_state()
+    player = state.list_player[state.idx_player_active]
+    opponent = state.list_player[(state.idx_player_active + 1) % 4]
+    jack = Card(suit='♠', rank='J')
+    player.list_card = [jack]
+    player.list_marble[0].pos = 0
+    opponent.list_marble[0].pos = 10
+    opponent.list_marble[0].is_save = False
+    assert Action(card=jack, pos_from=0, pos_to=10) in game_instance.get_list_action()
+
+    # a save marble cannot be swapped
+    opponent.list_marble[0].is_save = True
+    assert Action(card=jack, pos_from=0, pos_to=10) not in game_instance.get_list_action()
+
+    # a moved marble swaps from its new position
+    opponent.list_marble[0].is_save = False
+    player.list_marble[0].pos = 3
+    actions = game_instance.get_list_action()
+    assert Action(card=jack, pos_from=3, pos_to=10) in actions
+    assert Action(card=jack, pos_from=0, pos_to=10) not in actions
+
+    # the actions follow the hand
+    two = Card(suit='♥', rank='2')
+    player.list_card = [two]
+    actions = game_instance.get_list_action()
+    assert actions and all(action.card == two for action in actions)
+
+
+def test_list_action_returns_a_copy(game_instance):
+    state = game_instance.get_state()
+    player = state.list_player[state.idx_player_active]
+    player.list_card = [Card(suit='♠', rank='A')]
+    actions = game_instance.get_list_action()
+    expected = list(actions)
+    assert expected
+    actions.clear()
+    assert game_instance.get_list_action() == expected
+
+
+def test_actions_are_immutable(game_instance):
+    # actions are shared between games, so changing one must not be possible
+    state = game_instance.get_state()
+    player = state.list_player[state.idx_player_active]
+    player.list_card = [Card(suit='♠', rank='A')]
+    action = game_instance.get_list_action()[0]
+    with pytest.raises(ValidationError):
+        action.pos_to = 5
+    assert action.pos_to == 0